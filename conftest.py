@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the WhatsApp Search test suite.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The whatsapp_search module, imported once per test session."""
+    import whatsapp_search
+    return whatsapp_search
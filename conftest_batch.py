@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Pytest plugin for hash-based test sharding across CI workers.
+
+Loaded explicitly by run_tests.py via `-p conftest_batch` when
+--batch-index/--num-batches are given. Each worker keeps only the test
+items whose stable nodeid hash falls in its batch, so N CI jobs can
+split the suite roughly evenly without coordinating.
+"""
+
+import os
+import zlib
+
+
+def pytest_collection_modifyitems(config, items):
+    """Keep only the items belonging to this worker's batch."""
+    num_batches = int(os.environ.get("RUN_TESTS_NUM_BATCHES", "1"))
+    batch_index = int(os.environ.get("RUN_TESTS_BATCH_INDEX", "0"))
+
+    if num_batches <= 1:
+        return
+
+    # crc32 is stable across processes and Python versions (unlike
+    # built-in hash(), which is randomized per interpreter)
+    selected = [
+        item for item in items
+        if zlib.crc32(item.nodeid.encode()) % num_batches == batch_index
+    ]
+    deselected = [item for item in items if item not in selected]
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected